@@ -5,13 +5,32 @@
 import os
 import sys
 import time
+import signal
 import subprocess
 import logging
 import json
-from multiprocessing import Process, Manager
-from urllib.parse import urlparse
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import queue
+from multiprocessing import Process, Event, Lock, shared_memory
+from multiprocessing.managers import SyncManager, BaseProxy
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from collections import deque
+from contextlib import contextmanager
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
 
 # --- Configuration ---
 SERVICES_FILE = "services.txt"
@@ -20,11 +39,21 @@ REPOS_DIR = "repos"
 MAIN_LOOP_SLEEP = 5
 # How often each service process checks for Git updates (in seconds)
 GIT_CHECK_INTERVAL = 30
+# How long a remote branch head is trusted before asking the remote again (in seconds)
+REMOTE_CHECK_TTL = 300
+# How many repositories the main process checks for updates concurrently
+GIT_CHECK_WORKERS = 8
+# How long a script gets to exit after SIGTERM before it is killed (in seconds)
+SCRIPT_STOP_TIMEOUT = 10
 # API Server Configuration
 API_ENABLED = True
 API_HOST = "localhost"
 API_PORT = 8000
 MAX_LOG_ENTRIES = 20
+# How long a serialized /status response is reused before being rebuilt (in seconds)
+STATUS_CACHE_TTL = 1
+# Size of the shared memory block holding the JSON status of all services (in bytes)
+STATUS_SHM_SIZE = 1 << 20
 
 # --- Logging Setup ---
 # Main logger configuration
@@ -34,22 +63,132 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
     stream=sys.stdout,
 )
+# Formatter shared by all service log handlers
+_SHARED_FMT = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s")
 
 
 # --- Helper Classes and Functions ---
 
+class LogRing:
+    """A bounded buffer of log entries, hosted in the manager process."""
+    def __init__(self, maxlen):
+        self._entries = deque(maxlen=maxlen)
+
+    def append(self, entry):
+        self._entries.append(entry)
+
+    def snapshot(self):
+        return list(self._entries)
+
+class LogRingProxy(BaseProxy):
+    """Proxy for a LogRing; each call is a single round-trip to the manager."""
+    _exposed_ = ("append", "snapshot")
+
+    def append(self, entry):
+        return self._callmethod("append", (entry,))
+
+    def snapshot(self):
+        return self._callmethod("snapshot")
+
+class AutoExecManager(SyncManager):
+    """A SyncManager that can also host LogRing buffers."""
+
+AutoExecManager.register("LogRing", LogRing, LogRingProxy)
+
 class SharedLogHandler(logging.Handler):
-    """A logging handler that writes records to a shared list (from multiprocessing.Manager)."""
-    def __init__(self, shared_list):
+    """A logging handler that writes records to a shared LogRing (from AutoExecManager)."""
+    def __init__(self, ring):
         super().__init__()
-        self.shared_list = shared_list
+        self.ring = ring
 
     def emit(self, record):
-        log_entry = self.format(record)
-        self.shared_list.append(log_entry)
-        # Keep the list trimmed to the max size
-        while len(self.shared_list) > MAX_LOG_ENTRIES:
-            self.shared_list.pop(0)
+        # A single atomic append; the ring's maxlen keeps it trimmed
+        self.ring.append(self.format(record))
+
+class StatusBoard:
+    """
+    The status of the manager and all services, kept as a JSON document in shared memory.
+    Writers update it under a single lock; readers copy the bytes out without going through
+    the manager process. The block holds a 4-byte little-endian length followed by the JSON.
+    """
+    def __init__(self, size=STATUS_SHM_SIZE):
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._lock = Lock()
+        self._write({"manager_pid": None, "services": {}})
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds the board lock with SIGTERM blocked (on POSIX), so a terminated process
+        finishes its read or write and releases the lock before the signal is handled.
+        """
+        blocked = hasattr(signal, "pthread_sigmask")
+        if blocked:
+            previous = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+        try:
+            with self._lock:
+                yield
+        finally:
+            if blocked:
+                signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+
+    def _read(self):
+        size = int.from_bytes(self._shm.buf[:4], "little")
+        return bytes(self._shm.buf[4:4 + size])
+
+    def _write(self, document):
+        body = _dumps(document)
+        if len(body) + 4 > self._shm.size:
+            logging.error(f"Status document ({len(body)} bytes) exceeds STATUS_SHM_SIZE. Update dropped.")
+            return
+        self._shm.buf[4:4 + len(body)] = body
+        self._shm.buf[:4] = len(body).to_bytes(4, "little")
+
+    def read_bytes(self):
+        """Returns the serialized status document."""
+        with self._locked():
+            return self._read()
+
+    def read(self):
+        """Returns the status document as a dictionary."""
+        return _loads(self.read_bytes())
+
+    def service(self, path):
+        """Returns the status of a single service, or an empty dict if it isn't registered."""
+        return self.read()["services"].get(path, {})
+
+    def update(self, **fields):
+        """Updates top-level fields of the status document."""
+        with self._locked():
+            document = _loads(self._read())
+            document.update(fields)
+            self._write(document)
+
+    def update_service(self, path, **fields):
+        """Updates fields of a service's status, registering the service if needed."""
+        with self._locked():
+            document = _loads(self._read())
+            document["services"].setdefault(path, {}).update(fields)
+            self._write(document)
+
+    def set_service(self, path, status):
+        """Replaces a service's whole status."""
+        with self._locked():
+            document = _loads(self._read())
+            document["services"][path] = status
+            self._write(document)
+
+    def remove_service(self, path):
+        """Removes a service from the status document."""
+        with self._locked():
+            document = _loads(self._read())
+            document["services"].pop(path, None)
+            self._write(document)
+
+    def close(self):
+        """Releases the shared memory block; called by the process that created the board."""
+        self._shm.close()
+        self._shm.unlink()
 
 def run_command(command, cwd="."):
     """Executes a shell command and returns its output."""
@@ -66,19 +205,151 @@ def run_command(command, cwd="."):
         logging.error(f"Command not found: {command[0]}. Is it installed and in your PATH?")
         return None
 
+def run_command_streaming(command, cwd, logger):
+    """Executes a command, logging its combined output line by line, and returns its exit code."""
+    try:
+        logger.debug(f"Running command: {' '.join(command)} in {cwd}")
+        process = subprocess.Popen(
+            command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding='utf-8', errors='ignore', bufsize=1
+        )
+        with process.stdout:
+            for line in process.stdout:
+                line = line.rstrip()
+                if line:
+                    logger.info(line)
+        return process.wait()
+    except FileNotFoundError:
+        logger.error(f"Command not found: {command[0]}. Is it installed and in your PATH?")
+        return None
+
+def remote_head(repo_path, branch):
+    """Returns the commit hash of the remote branch head, or None if it cannot be resolved."""
+    ref = f"refs/heads/{branch}"
+    output = run_command(["git", "ls-remote", "origin", ref], cwd=repo_path)
+    if not output:
+        return None
+    # ls-remote matches patterns by suffix, so only accept the exact ref
+    for line in output.splitlines():
+        sha, _, name = line.partition("\t")
+        if name == ref:
+            return sha
+    return None
+
+def local_head(repo_path):
+    """Returns the commit hash checked out in a repository, reading .git/HEAD directly when possible."""
+    git_dir = os.path.join(repo_path, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            # Detached HEAD holds the commit hash itself, of any length (SHA-1 or SHA-256)
+            return head
+        with open(os.path.join(git_dir, head[5:]), "r") as f:
+            return f.read().strip()
+    except OSError:
+        # The ref may only exist in packed-refs; let git resolve it
+        return run_command(["git", "rev-parse", "HEAD"], cwd=repo_path)
+
+def check_service_heads(repo_path, branch):
+    """Returns the remote and local commit hashes of a service repository, for its status."""
+    return {"remote_head": remote_head(repo_path, branch), "local_head": local_head(repo_path)}
+
+def start_script(script_to_run, cwd):
+    """Starts a Python script in its own process group so its descendants can be stopped with it."""
+    if os.name == "nt":
+        return subprocess.Popen(
+            [sys.executable, script_to_run], cwd=cwd, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    # Python creates descriptors non-inheritable, so there is nothing to close, and the
+    # interpreter sets its own SIGPIPE/SIGXFSZ handling; skip both for faster restarts.
+    return subprocess.Popen(
+        [sys.executable, script_to_run], cwd=cwd, start_new_session=True,
+        close_fds=False, restore_signals=False
+    )
+
+def stop_script(child_process, timeout=SCRIPT_STOP_TIMEOUT):
+    """Terminates a script started by start_script, killing its process group if it doesn't exit in time."""
+    if os.name == "nt":
+        try:
+            # Delivered to the whole process group created by start_script
+            child_process.send_signal(signal.CTRL_BREAK_EVENT)
+            child_process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            # No shared console, or the script ignored it: kill the whole process tree
+            run_command(["taskkill", "/F", "/T", "/PID", str(child_process.pid)])
+            child_process.wait()
+        return
+
+    try:
+        os.killpg(child_process.pid, signal.SIGTERM)
+        child_process.wait(timeout=timeout)
+    except ProcessLookupError:
+        child_process.wait()
+    except subprocess.TimeoutExpired:
+        logging.warning(f"Script {child_process.pid} did not exit after SIGTERM. Killing it.")
+        try:
+            os.killpg(child_process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        child_process.wait()
+
+def stop_orphaned_script(script_pid, timeout=SCRIPT_STOP_TIMEOUT):
+    """
+    Stops the process group of a script left running by a service process that died
+    without stopping it. Scripts run in their own session, so they outlive their service.
+    """
+    if script_pid is None or os.name == "nt":
+        return
+    try:
+        os.killpg(script_pid, signal.SIGTERM)
+    except OSError:
+        return # Already gone
+    logging.warning(f"Stopping script {script_pid} left behind by its service process...")
+    # The script isn't our child, so poll its process group instead of waiting on it
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.1)
+        try:
+            os.killpg(script_pid, 0)
+        except OSError:
+            return
+    logging.warning(f"Script {script_pid} did not exit after SIGTERM. Killing it.")
+    try:
+        os.killpg(script_pid, signal.SIGKILL)
+    except OSError:
+        pass
+
 def get_repo_name_from_url(url):
     """Extracts a repository name from a Git URL."""
-    path = urlparse(url).path
-    repo_name = os.path.splitext(os.path.basename(path))[0]
+    # Local paths on Windows use backslashes
+    repo_name = url.replace("\\", "/").rsplit("/", 1)[-1]
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-4]
     return repo_name if repo_name else "unknown_repo"
 
+# Absolute repos directory, resolved once for building service paths
+_REPOS_ABS = os.path.abspath(REPOS_DIR)
+# Last parsed services file, keyed on its modification time and size
+_svc_cache = {"key": None, "value": {}}
+
 def parse_services_file():
-    """Parses the services.txt file and returns a dictionary of service configurations."""
+    """
+    Parses the services.txt file and returns a dictionary of service configurations.
+    The result is cached until the file's modification time or size changes.
+    """
     services = {}
-    if not os.path.exists(SERVICES_FILE):
+    try:
+        st = os.stat(SERVICES_FILE)
+    except OSError:
         logging.warning(f"'{SERVICES_FILE}' not found. No services to manage.")
+        _svc_cache["key"] = None
         return services
 
+    key = (st.st_mtime_ns, st.st_size)
+    if key == _svc_cache["key"]:
+        return _svc_cache["value"]
+
     with open(SERVICES_FILE, "r") as f:
         for line in f:
             line = line.strip()
@@ -89,46 +360,97 @@ def parse_services_file():
             url = parts[0]
             branch = parts[1] if len(parts) > 1 else "main"
             dir_name = parts[2] if len(parts) > 2 else get_repo_name_from_url(url)
-            repo_path = os.path.abspath(os.path.join(REPOS_DIR, dir_name))
+            # normpath folds "foo", "./foo" and "foo/" into one key; join keeps absolute names as given
+            repo_path = os.path.normpath(os.path.join(_REPOS_ABS, dir_name))
             
             services[repo_path] = {"url": url, "branch": branch, "path": repo_path}
+
+    _svc_cache["key"] = key
+    _svc_cache["value"] = services
     return services
 
+def watch_services_file(wake):
+    """
+    Starts a watchdog observer that posts to the wake queue whenever the services file changes.
+    Returns the observer, or None if watchdog is not installed.
+    """
+    if Observer is None:
+        return None
+    services_path = os.path.abspath(SERVICES_FILE)
+
+    class ServicesFileHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if services_path in (event.src_path, getattr(event, "dest_path", None)):
+                wake.put(None)
+
+    observer = Observer()
+    observer.daemon = True
+    observer.schedule(ServicesFileHandler(), os.path.dirname(services_path), recursive=False)
+    observer.start()
+    return observer
+
 # --- API Server Implementation ---
 
-def create_api_handler(shared_status):
+# Last serialized /status body, shared by all requests served by the API process
+_status_cache = {"ts": 0, "body": b""}
+
+def create_api_handler(board, shared_logs):
     """Factory function to create the request handler class with shared state."""
     class StatusAPIRequestHandler(BaseHTTPRequestHandler):
+        # Keep connections open so polling clients don't reconnect for every request
+        protocol_version = "HTTP/1.1"
+
         def __init__(self, *args, **kwargs):
-            self.shared_status = shared_status
+            self.board = board
+            self.shared_logs = shared_logs
             super().__init__(*args, **kwargs)
 
         def do_GET(self):
             if self.path == '/status':
+                body = self.status_body()
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
                 self.end_headers()
-                # Convert Manager objects to regular Python objects for JSON serialization
-                status_copy = {
-                    "manager_pid": self.shared_status.get("manager_pid"),
-                    "api_url": f"http://{API_HOST}:{API_PORT}/status",
-                    "services": {
-                        path: {k: list(v) if isinstance(v, list.__class__) else v for k, v in service.items()}
-                        for path, service in self.shared_status.get("services", {}).items()
-                    }
-                }
-                self.wfile.write(json.dumps(status_copy, indent=4).encode('utf-8'))
+                self.wfile.write(body)
             else:
                 self.send_response(404)
+                self.send_header('Content-Length', '9')
                 self.end_headers()
                 self.wfile.write(b'Not Found')
+
+        def status_body(self):
+            """Returns the serialized status, rebuilding it at most once per STATUS_CACHE_TTL."""
+            now = time.monotonic()
+            if now - _status_cache["ts"] < STATUS_CACHE_TTL:
+                return _status_cache["body"]
+
+            # The status comes straight from shared memory; only the logs live in the manager,
+            # and copy() and snapshot() each fetch them in a single round-trip.
+            status = self.board.read()
+            rings = self.shared_logs.copy()
+            for path, service in status["services"].items():
+                ring = rings.get(path)
+                service["logs"] = ring.snapshot() if ring is not None else []
+
+            status_copy = {
+                "manager_pid": status["manager_pid"],
+                "api_url": f"http://{API_HOST}:{API_PORT}/status",
+                "services": status["services"],
+            }
+            body = _dumps(status_copy)
+            _status_cache["ts"] = now
+            _status_cache["body"] = body
+            return body
     return StatusAPIRequestHandler
 
-def run_api_server(shared_status, host, port):
+def run_api_server(board, shared_logs, host, port):
     """The target function to run the HTTP server in its own process."""
+    _reset_sigchld()
     try:
-        handler = create_api_handler(shared_status)
-        httpd = HTTPServer((host, port), handler)
+        handler = create_api_handler(board, shared_logs)
+        # Serve each connection in its own daemon thread so a slow client can't block the others
+        httpd = ThreadingHTTPServer((host, port), handler)
         logging.info(f"API server started on http://{host}:{port}")
         httpd.serve_forever()
     except Exception as e:
@@ -137,13 +459,31 @@ def run_api_server(shared_status, host, port):
 
 # --- Service Management ---
 
-def manage_service(service_config, shared_status_dict):
+def _reset_sigchld():
+    """Restores the default SIGCHLD action in a forked process, which inherits the main loop's handler."""
+    if hasattr(signal, "SIGCHLD"):
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+def _exit_on_sigterm(signum, frame):
+    """
+    Turns SIGTERM into SystemExit, so a service terminated mid-update unwinds through
+    the status board's lock and its own cleanup instead of dying while holding them.
+    """
+    sys.exit(0)
+
+def manage_service(service_config, board, shared_logs, shutdown_event):
     """
     The main function for a service process. It manages cloning, updating,
-    and running the target Python script, while reporting status to a shared dictionary.
+    and running the target Python script, while reporting status to the shared status board.
+    The log ring is created by the main process's manager.
+    The process exits cleanly once shutdown_event is set. Remote update checks are
+    done by the main process, which publishes the remote head on the status board.
     """
     repo_path = service_config["path"]
     process_name = os.path.basename(repo_path)
+    _reset_sigchld()
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
     
     # Setup logger for this specific service
     service_logger = logging.getLogger(process_name)
@@ -151,104 +491,160 @@ def manage_service(service_config, shared_status_dict):
     # Prevent logs from propagating to the root logger to avoid duplicates
     service_logger.propagate = False 
 
-    # Prepare shared state for this service
-    with Manager() as manager: # A sub-manager for lists and dicts
-        shared_logs = manager.list()
-        handler = SharedLogHandler(shared_logs)
-        handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s"))
-        service_logger.addHandler(handler)
-
-        service_status = manager.dict({
-            "status": "initializing",
-            "url": service_config["url"],
-            "branch": service_config["branch"],
-            "repo_path": repo_path,
-            "script_to_run": None,
-            "service_manager_pid": os.getpid(),
-            "script_pid": None,
-            "logs": shared_logs
-        })
-        shared_status_dict[repo_path] = service_status
-
-        # 1. Clone repo if needed
-        service_status["status"] = "cloning"
-        if not os.path.isdir(os.path.join(repo_path, ".git")):
-            service_logger.info(f"Cloning {service_config['url']}...")
-            os.makedirs(repo_path, exist_ok=True)
-            clone_cmd = ["git", "clone", "--branch", service_config["branch"], service_config["url"], "."]
-            if run_command(clone_cmd, cwd=repo_path) is None:
-                service_logger.error("Failed to clone repository. Shutting down service manager.")
-                service_status["status"] = "failed"
-                return
-        
-        child_process = None
-        
+    # Attach the shared state prepared by the main process
+    handler = SharedLogHandler(shared_logs)
+    handler.setFormatter(_SHARED_FMT)
+    service_logger.addHandler(handler)
+
+    # 1. Clone repo if needed
+    board.update_service(repo_path, status="cloning", service_manager_pid=os.getpid())
+    if not os.path.isdir(os.path.join(repo_path, ".git")):
+        service_logger.info(f"Cloning {service_config['url']}...")
+        os.makedirs(repo_path, exist_ok=True)
+        # Only the checked-out branch is needed: skip older history and unrelated tags
+        clone_cmd = [
+            "git", "clone", "--branch", service_config["branch"], "--depth", "1",
+            "--single-branch", "--no-tags", service_config["url"], "."
+        ]
+        if run_command_streaming(clone_cmd, repo_path, service_logger) != 0:
+            service_logger.error("Failed to clone repository. Shutting down service manager.")
+            board.update_service(repo_path, status="failed")
+            # Hold off before exiting, since the main process respawns dead services right away
+            shutdown_event.wait(GIT_CHECK_INTERVAL)
+            return
+    
+    child_process = None
+    # The local head only changes when we pull, so it is read once and cached
+    cached_local_head = None
+    
+    # Stop the script however the loop ends, including KeyboardInterrupt from Ctrl+C,
+    # since it runs in its own session and doesn't receive the terminal's signals
+    try:
         while True:
             try:
-                # 2. Check for updates
-                service_logger.debug("Fetching updates from remote...")
-                run_command(["git", "fetch"], cwd=repo_path)
-                local_hash = run_command(["git", "rev-parse", "HEAD"], cwd=repo_path)
-                remote_hash = run_command(["git", "rev-parse", f"origin/{service_config['branch']}"], cwd=repo_path)
-                has_updates = local_hash != remote_hash and remote_hash is not None
+                # 2. Check for updates published by the main process
+                if cached_local_head is None:
+                    cached_local_head = local_head(repo_path)
+                remote_hash = board.service(repo_path).get("remote_head")
+                has_updates = remote_hash is not None and remote_hash != cached_local_head
 
                 # 3. Handle process execution
                 if child_process and child_process.poll() is not None:
                     service_logger.warning("Script has terminated unexpectedly. Restarting...")
-                    service_status["status"] = "crashed"
-                    service_status["script_pid"] = None
+                    board.update_service(repo_path, status="crashed", script_pid=None)
                     child_process = None
 
                 if has_updates:
-                    service_status["status"] = "updating"
+                    board.update_service(repo_path, status="updating")
                     service_logger.info("New updates found. Restarting script.")
                     if child_process:
                         service_logger.info("Terminating running script...")
-                        child_process.terminate()
-                        child_process.wait()
-                        service_status["script_pid"] = None
+                        stop_script(child_process)
+                        board.update_service(repo_path, script_pid=None)
                         child_process = None
-                    
+                
                     service_logger.info("Pulling latest changes...")
-                    if run_command(["git", "pull", "origin", service_config["branch"]], cwd=repo_path) is None:
+                    pull_cmd = ["git", "pull", "origin", service_config["branch"]]
+                    if run_command_streaming(pull_cmd, repo_path, service_logger) != 0:
                         service_logger.error("Failed to pull updates. Retrying later.")
-                        time.sleep(GIT_CHECK_INTERVAL)
+                        if shutdown_event.wait(GIT_CHECK_INTERVAL):
+                            break
                         continue
+                    cached_local_head = None
+                    # Wait for a fresh remote check rather than comparing against the one we just pulled
+                    board.update_service(repo_path, remote_head=None)
 
                 if not child_process:
                     autoexec_path = os.path.join(repo_path, "autoexec.txt")
                     if not os.path.exists(autoexec_path):
                         service_logger.error("'autoexec.txt' not found. Cannot start script.")
-                        time.sleep(GIT_CHECK_INTERVAL)
+                        if shutdown_event.wait(GIT_CHECK_INTERVAL):
+                            break
                         continue
-                    
+                
                     with open(autoexec_path, "r") as f:
                         script_to_run = f.read().strip()
-                    service_status["script_to_run"] = script_to_run
+                    board.update_service(repo_path, script_to_run=script_to_run)
 
                     script_path = os.path.join(repo_path, script_to_run)
                     if not script_to_run or not os.path.exists(script_path):
                         service_logger.error(f"Script '{script_to_run}' not found or invalid.")
-                        time.sleep(GIT_CHECK_INTERVAL)
+                        if shutdown_event.wait(GIT_CHECK_INTERVAL):
+                            break
                         continue
 
                     service_logger.info(f"Starting script: python {script_to_run}")
-                    child_process = subprocess.Popen([sys.executable, script_to_run], cwd=repo_path)
-                    service_status["status"] = "running"
-                    service_status["script_pid"] = child_process.pid
-                
-                time.sleep(GIT_CHECK_INTERVAL)
+                    child_process = start_script(script_to_run, repo_path)
+                    board.update_service(repo_path, status="running", script_pid=child_process.pid)
+            
+                if shutdown_event.wait(GIT_CHECK_INTERVAL):
+                    break
 
             except Exception as e:
                 service_logger.error(f"Unexpected error in service manager: {e}")
                 if child_process:
-                    child_process.terminate()
-                service_status["status"] = "failed"
-                time.sleep(GIT_CHECK_INTERVAL)
+                    stop_script(child_process)
+                    child_process = None
+                board.update_service(repo_path, status="failed", script_pid=None)
+                if shutdown_event.wait(GIT_CHECK_INTERVAL):
+                    break
+    except KeyboardInterrupt:
+        pass # The main process reports the shutdown
+    finally:
+        if child_process:
+            service_logger.info("Shutdown requested. Terminating running script...")
+            stop_script(child_process)
+            board.update_service(repo_path, script_pid=None)
 
 
 # --- Main Application Logic ---
 
+def start_service_process(manager, board, shared_logs, service_config, name, shutdown_event):
+    """
+    Registers a fresh status and log ring for a service and spawns its process.
+    The log ring is kept alive by the shared_logs dictionary that the API reads from.
+    """
+    path = service_config["path"]
+    ring = manager.LogRing(MAX_LOG_ENTRIES)
+    shared_logs[path] = ring
+    board.set_service(path, {
+        "status": "initializing",
+        "url": service_config["url"],
+        "branch": service_config["branch"],
+        "repo_path": path,
+        "script_to_run": None,
+        "service_manager_pid": None,
+        "script_pid": None,
+        "remote_head": None,
+        "local_head": None,
+    })
+    process = Process(
+        target=manage_service,
+        args=(service_config, board, ring, shutdown_event),
+        name=name,
+    )
+    process.start()
+    return process
+
+def stop_service_processes(stopping, timeout=SCRIPT_STOP_TIMEOUT + 5):
+    """
+    Asks service processes, given as (process, shutdown_event) pairs, to exit at their next
+    wait point. All of them are signalled first and joined against one shared deadline, and
+    those still running then are terminated, again against one shared deadline.
+    """
+    for process, shutdown_event in stopping:
+        shutdown_event.set()
+    deadline = time.monotonic() + timeout
+    for process, _ in stopping:
+        process.join(timeout=max(0, deadline - time.monotonic()))
+
+    stragglers = [process for process, _ in stopping if process.is_alive()]
+    for process in stragglers:
+        process.terminate()
+    deadline = time.monotonic() + timeout
+    for process in stragglers:
+        process.join(timeout=max(0, deadline - time.monotonic()))
+
 def main():
     """Main loop that reads services.txt and manages service processes and the API server."""
     logging.info("--- AutoExec.py Manager Started ---")
@@ -259,16 +655,35 @@ def main():
         logging.critical("Git is not installed or not in PATH. Exiting.")
         return
 
-    manager = Manager()
-    shared_status = manager.dict()
-    shared_status["manager_pid"] = os.getpid()
-    shared_status["services"] = manager.dict()
+    # Wake-ups for the main loop. SimpleQueue.put is reentrant, so unlike Event.set it is
+    # safe to call from a signal handler that interrupts the main thread while it waits.
+    wake = queue.SimpleQueue()
+    # Wake as soon as the services file is edited, when watchdog is available
+    observer = watch_services_file(wake)
+
+    manager = AutoExecManager()
+    manager.start()
+    # ...and as soon as a child process exits (POSIX only). Installed after the manager
+    # process is forked; service and API processes reset it themselves.
+    if hasattr(signal, "SIGCHLD"):
+        signal.signal(signal.SIGCHLD, lambda *args: wake.put(None))
+    # Service logs per path, hosted by the manager
+    shared_logs = manager.dict()
+    board = StatusBoard()
+    board.update(manager_pid=os.getpid())
     
     managed_processes = {}
+    shutdown_events = {}
     api_process = None
+    # Remote update checks for all services run concurrently in the main process
+    git_pool = ThreadPoolExecutor(max_workers=GIT_CHECK_WORKERS)
+    pending_checks = {}
+    last_git_check = 0
+    # Last successful remote check per service: {"remote_head", "local_head", "ts"}
+    remote_cache = {}
 
     if API_ENABLED:
-        api_process = Process(target=run_api_server, args=(shared_status, API_HOST, API_PORT), name="APIServer")
+        api_process = Process(target=run_api_server, args=(board, shared_logs, API_HOST, API_PORT), name="APIServer")
         api_process.start()
         managed_processes["_api_server"] = api_process
 
@@ -276,19 +691,26 @@ def main():
         while True:
             desired_services = parse_services_file()
             desired_paths = set(desired_services.keys())
-            current_paths = set(shared_status["services"].keys())
+            # Services started by this loop
+            current_paths = set(managed_processes) - {"_api_server"}
 
-            # Stop services removed from config
-            for path in current_paths - desired_paths:
+            # Stop services removed from config, all at once
+            removed_paths = current_paths - desired_paths
+            stopping = []
+            for path in removed_paths:
                 logging.info(f"Service for {path} removed from config. Stopping...")
-                if path in managed_processes:
-                    process = managed_processes.pop(path)
-                    if process.is_alive():
-                        process.terminate()
-                        process.join(timeout=5)
+                process = managed_processes.pop(path)
+                if process.is_alive():
+                    stopping.append((process, shutdown_events[path]))
+                else:
+                    stop_orphaned_script(board.service(path).get("script_pid"))
+            stop_service_processes(stopping)
+            for path in removed_paths:
+                shutdown_events.pop(path, None)
+                remote_cache.pop(path, None)
                 # Remove from shared status
-                if path in shared_status["services"]:
-                    del shared_status["services"][path]
+                board.remove_service(path)
+                shared_logs.pop(path, None)
                 logging.info(f"Process for {path} stopped.")
 
             # Start new services
@@ -296,30 +718,91 @@ def main():
                 logging.info(f"New service for {path} found. Starting...")
                 service_config = desired_services[path]
                 process_name = os.path.basename(path)
-                process = Process(target=manage_service, args=(service_config, shared_status["services"]), name=process_name)
-                process.start()
-                managed_processes[path] = process
+                shutdown_events[path] = Event()
+                managed_processes[path] = start_service_process(
+                    manager, board, shared_logs, service_config, process_name, shutdown_events[path]
+                )
             
             # Health check on processes
             for path, process in list(managed_processes.items()):
                 if path == "_api_server": continue # Don't respawn API server here
                 if not process.is_alive():
                     logging.warning(f"Process for {path} has died unexpectedly. It will be restarted.")
+                    # Don't let the new process start a second copy of the script
+                    stop_orphaned_script(board.service(path).get("script_pid"))
                     service_config = desired_services[path]
-                    new_process = Process(target=manage_service, args=(service_config, shared_status["services"]), name=process.name)
-                    new_process.start()
-                    managed_processes[path] = new_process
+                    # A process that died while waiting can leave its event unusable, so use a new one
+                    shutdown_events[path] = Event()
+                    managed_processes[path] = start_service_process(
+                        manager, board, shared_logs, service_config, process.name, shutdown_events[path]
+                    )
+                    # The new status starts empty, so the remote must be checked again
+                    remote_cache.pop(path, None)
+
+            # Publish finished update checks to the services' status
+            for path, future in list(pending_checks.items()):
+                if future.done():
+                    del pending_checks[path]
+                    try:
+                        heads = future.result()
+                    except Exception as e:
+                        # e.g. the repository was replaced while it was being checked
+                        logging.error(f"Update check for {path} failed: {e}")
+                        heads = {"remote_head": None, "local_head": None}
+                    if heads["remote_head"] is not None:
+                        remote_cache[path] = dict(heads, ts=time.monotonic())
+                    if path in managed_processes:
+                        board.update_service(path, **heads)
+
+            # Check all cloned repositories for updates in parallel
+            now = time.monotonic()
+            if now - last_git_check >= GIT_CHECK_INTERVAL:
+                last_git_check = now
+                statuses = board.read()["services"]
+                for path, service_config in desired_services.items():
+                    if path not in managed_processes or path in pending_checks:
+                        continue
+                    # .git exists before a clone has finished, so wait for the service to get past it
+                    if statuses.get(path, {}).get("status") in ("initializing", "cloning"):
+                        continue
+                    if not os.path.isdir(os.path.join(path, ".git")):
+                        continue
+                    # Skip the network while the last remote head is fresh and nothing was pulled since
+                    cached = remote_cache.get(path)
+                    if cached and now - cached["ts"] < REMOTE_CHECK_TTL and local_head(path) == cached["local_head"]:
+                        continue
+                    pending_checks[path] = git_pool.submit(check_service_heads, path, service_config["branch"])
+                    pending_checks[path].add_done_callback(lambda future: wake.put(None))
 
-            time.sleep(MAIN_LOOP_SLEEP)
+            # Sleep until something happens, but no later than the next update check
+            next_git_check = last_git_check + GIT_CHECK_INTERVAL - time.monotonic()
+            try:
+                wake.get(timeout=max(0, min(MAIN_LOOP_SLEEP, next_git_check)))
+                # Several wake-ups may have arrived at once; one loop pass handles them all
+                while True:
+                    wake.get_nowait()
+            except queue.Empty:
+                pass
 
     except KeyboardInterrupt:
         logging.info("Shutdown signal received. Terminating all managed services...")
     finally:
+        if observer is not None:
+            observer.stop()
+        git_pool.shutdown(wait=False)
+        stopping = []
         for name, process in managed_processes.items():
-            if process.is_alive():
+            if name in shutdown_events and process.is_alive():
                 logging.info(f"Stopping process for {name}...")
-                process.terminate()
-                process.join(timeout=5)
+                stopping.append((process, shutdown_events[name]))
+        stop_service_processes(stopping)
+        # Stop the API server last: it may hold the status board lock when terminated,
+        # which would block services still reporting their final status
+        if api_process is not None and api_process.is_alive():
+            logging.info("Stopping API server...")
+            api_process.terminate()
+            api_process.join(timeout=5)
+        board.close()
         logging.info("--- AutoExec.py Manager Shut Down ---")
 
 if __name__ == "__main__":